@@ -1,18 +1,87 @@
 """
 The module of result database.
 """
+import base64
+import heapq
+import io
+import json
 import os
 import pickle
+import struct
 import sys
-from queue import PriorityQueue
 from threading import Lock
 from time import time
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
 
 from .logger import get_default_logger
 from .parameter import gen_key_from_design_point
 from .result import HLSResult, MerlinResult, Result
 
+# The prefix of the results serialized by encode_result
+PICKLE_PREFIX = 'pickle:'
+
+
+def encode_result(obj: Any) -> str:
+    """Serialize an object to a JSON compatible string.
+
+    The object is pickled by the C pickler and encoded in base64, which is much faster and
+    more compact than walking the object with jsonpickle.
+
+    Args:
+        obj: The object to be serialized.
+
+    Returns:
+        The serialized string.
+    """
+
+    return PICKLE_PREFIX + base64.b64encode(pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)).decode(
+        encoding='ascii')
+
+
+def decode_result(data: str) -> Any:
+    """Deserialize a string generated by encode_result.
+
+    Strings without the pickle prefix are from the database persisted by jsonpickle,
+    so we fall back to jsonpickle for them.
+
+    Args:
+        data: The serialized string.
+
+    Returns:
+        The deserialized object.
+    """
+
+    if data.startswith(PICKLE_PREFIX):
+        return pickle.loads(base64.b64decode(data[len(PICKLE_PREFIX):]))
+
+    import jsonpickle
+    return jsonpickle.decode(data)
+
+
+def pickle_batch(objs: List[Any]) -> List[bytes]:
+    """Pickle a list of objects with a single pickler.
+
+    The pickler and its output buffer are reused for all objects. The memo is cleared after
+    each object so every slice of the buffer is a self-contained pickle.
+
+    Args:
+        objs: The objects to be pickled.
+
+    Returns:
+        A list of pickled objects in the same order.
+    """
+
+    buf = io.BytesIO()
+    pickler = pickle.Pickler(buf, pickle.HIGHEST_PROTOCOL)
+    offsets = [0]
+    for obj in objs:
+        pickler.dump(obj)
+        pickler.clear_memo()
+        offsets.append(buf.tell())
+
+    data = buf.getvalue()
+    return [data[start:end] for start, end in zip(offsets, offsets[1:])]
+
 
 class Database():
     """Base class of result database
@@ -21,16 +90,25 @@ class Database():
         db_id: A unique ID of this database.
         log: Logger
         db_file_path: Path to persist the database.
-        best_cache: A priority queue for best results.
+        best_cache: A min heap for the keys of best results.
+        best_cache_size: The maximum number of results kept in the best cache.
+        best_lock: The thread lock of the best cache.
         code_hash_map: A dictionary to map code hash to the corresponding HLS result.
     """
 
-    def __init__(self, name: str, db_file_path: Optional[str] = None):
+    # The number of values fetched and deserialized at a time by iter_query
+    QUERY_CHUNK_SIZE = 256
+
+    def __init__(self,
+                 name: str,
+                 db_file_path: Optional[str] = None,
+                 best_cache_size: Optional[int] = None):
         """Constructor
 
         Args:
             name: Database name.
             db_file_path: Path to persist the database.
+            best_cache_size: The maximum number of best results to keep, or None for unlimited.
         """
 
         self.db_id = '{0}-{1}'.format(name, int(time()))
@@ -45,40 +123,52 @@ class Database():
             self.db_file_path = db_file_path
 
         # Current best result set (min heap)
-        # Note: the element type in this PriorityQueue is (quality, timestamp, result).
+        # Note: the element type in this heap is (quality, timestamp, key). We keep the key
+        # instead of the result object to avoid holding results alive only for the cache.
         # The purpose of using timestamp is to deal with points with same qualities,
-        # since PriorityQueue tries to compare the second tuple value if the first one
-        # is the same. We define the first point among the same quality points is
-        # the one we want.
-        # FIXME: we now rely on the main flow to control the size in order to
-        # avoid race condition.
-        self.best_cache: PriorityQueue = PriorityQueue()
+        # since heapq tries to compare the second tuple value if the first one
+        # is the same. Once the heap is full, the worst result is popped out so only the
+        # best results are kept.
+        self.best_cache: List[Tuple[float, float, str]] = []
+        self.best_cache_size = best_cache_size
+        self.best_lock = Lock()
 
         # Code hash set
         # The purpose of the set is to avoid taking two points that result in the same
         # HLS code generated by Merlin.
         self.code_hash_map: Dict[str, str] = {}
 
-    def init_best_cache(self) -> None:
-        """Initialize the best cache using the loaded data."""
-
-        if self.count() == 0:
-            return
-
-        for result in [r for r in self.query_all() if isinstance(r, HLSResult) and r.valid]:
-            if result.ret_code != Result.RetCode.DUPLICATED:
-                self.best_cache.put((result.quality, time(), result), timeout=0.1)
-
-    def init_code_hash_map(self) -> None:
-        """Initialize the code hash set using the loaded data."""
+    def _init_caches(self) -> None:
+        """Initialize the best cache and the code hash map using the loaded data."""
 
         if self.count() == 0:
             return
 
-        for result in [r for r in self.query_all() if isinstance(r, MerlinResult)]:
-            if result.code_hash is not None and result.ret_code != Result.RetCode.DUPLICATED:
-                assert result.point is not None
-                self.code_hash_map[result.code_hash] = gen_key_from_design_point(result.point)
+        # Scan the loaded data only once for both caches
+        best_entries: List[Tuple[float, float, str]] = []
+        for key, result in self.iter_query(self.query_keys()):
+            if not isinstance(result, Result) or result.ret_code == Result.RetCode.DUPLICATED:
+                continue
+            if isinstance(result, HLSResult):
+                if result.valid:
+                    best_entries.append((result.quality, time(), key))
+            elif isinstance(result, MerlinResult):
+                if result.code_hash is not None:
+                    # Results are committed with the key "lv<level>:<point key>" so we reuse
+                    # the point key instead of generating it from the design point again
+                    prefix, _, point_key = key.partition(':')
+                    if not prefix.startswith('lv') or not point_key:
+                        assert result.point is not None
+                        point_key = gen_key_from_design_point(result.point)
+                    self.code_hash_map[result.code_hash] = point_key
+
+        # Build the heap at once, which is O(N) instead of O(NlogN) by pushing one by one
+        with self.best_lock:
+            best_entries.extend(self.best_cache)
+            if self.best_cache_size is not None and len(best_entries) > self.best_cache_size:
+                best_entries = heapq.nlargest(self.best_cache_size, best_entries)
+            heapq.heapify(best_entries)
+            self.best_cache = best_entries
 
     def add_code_hash(self, code_hash: str, key: str) -> Optional[str]:
         """Add a new code hash to the map and check if it already exists.
@@ -91,29 +181,70 @@ class Database():
             None if the code hash is new; otherwise the key with the same code hash.
         """
 
-        if code_hash in self.code_hash_map:
-            return self.code_hash_map[code_hash]
+        # Look up the map only once on the hit path
+        existing_key = self.code_hash_map.get(code_hash)
+        if existing_key is not None:
+            return existing_key
         self.code_hash_map[code_hash] = key
         return None
 
-    def update_best(self, result: Result) -> None:
+    def push_best_cache(self, entry: Tuple[float, float, str]) -> None:
+        """Push a new entry to the best cache and pop the worst one if the cache is full.
+
+        Args:
+            entry: The (quality, timestamp, key) tuple to be pushed.
+        """
+
+        with self.best_lock:
+            if self.best_cache_size is None or len(self.best_cache) < self.best_cache_size:
+                heapq.heappush(self.best_cache, entry)
+            else:
+                heapq.heappushpop(self.best_cache, entry)
+
+    def peek_best(self) -> Optional[Tuple[float, float, str]]:
+        """Peek the best entry in the best cache without fetching its result.
+
+        Returns:
+            The (quality, timestamp, key) tuple of the best result, or None if the cache is empty.
+        """
+
+        with self.best_lock:
+            return max(self.best_cache) if self.best_cache else None
+
+    def query_best(self, k: int = 1) -> List[Tuple[float, float, Result]]:
+        """Query the best results in the best cache.
+
+        Args:
+            k: The number of results to be returned.
+
+        Returns:
+            A list of (quality, timestamp, result) tuples from the best to the worst.
+        """
+
+        with self.best_lock:
+            entries = heapq.nlargest(k, self.best_cache)
+
+        # Fetch the results of the best keys on demand
+        results = self.batch_query([key for _, _, key in entries])
+        return [(quality, timestamp, result)
+                for (quality, timestamp, _), result in zip(entries, results)
+                if result is not None]
+
+    def update_best(self, key: str, result: Result) -> None:
         """Check if the new result has the best QoR and update it if so.
 
         Note:
             We allow value overwritten in the database for the performance issue,
             although it should not happen during the search. However, the best cache
-            may keep the overrided result so this could be a potential issue.
+            may keep the quality of the overrided result so this could be a potential issue.
 
         Args:
+            key: The key of the new result.
             result: The new result to be checked.
         """
 
         if result.ret_code != Result.RetCode.DUPLICATED:
-            try:
-                self.best_cache.put((result.quality, time(), result))
-            except Exception as err:
-                self.log.error('Failed to update best cache: %s', str(err))
-                raise RuntimeError()
+            self.push_best_cache((result.quality, time(), key))
 
     def commit(self, key: str, result: Any) -> None:
         """Commit a new result to the database.
@@ -129,7 +260,7 @@ class Database():
             sys.exit(1)
 
         if isinstance(result, Result):
-            self.update_best(result)
+            self.update_best(key, result)
 
     def batch_commit(self, pairs: List[Tuple[str, Any]]) -> None:
         """Commit a set of new results to the database.
@@ -144,9 +275,9 @@ class Database():
             sys.exit(1)
 
         # Update the best result
-        for _, result in pairs:
+        for key, result in pairs:
             if isinstance(result, Result):
-                self.update_best(result)
+                self.update_best(key, result)
 
     def query_all(self) -> List[Any]:
         """Query all values in the database.
@@ -156,6 +287,25 @@ class Database():
         """
         return [v for v in self.batch_query(self.query_keys()) if v is not None]
 
+    def iter_query(self, keys: List[str]) -> Iterator[Tuple[str, Any]]:
+        """Iterate the values of the given keys.
+
+        Values are fetched and deserialized chunk by chunk when the iterator is consumed,
+        so we neither decode everything upfront nor keep all of them alive at once.
+
+        Args:
+            keys: A list of keys.
+
+        Returns:
+            An iterator of key-value pairs. Unavailable keys are skipped.
+        """
+
+        for start in range(0, len(keys), self.QUERY_CHUNK_SIZE):
+            chunk = keys[start:start + self.QUERY_CHUNK_SIZE]
+            for key, value in zip(chunk, self.batch_query(chunk)):
+                if value is not None:
+                    yield key, value
+
     def load(self) -> None:
         """Load existing data from the given database and update the best cahce (if available)."""
         raise NotImplementedError()
@@ -226,34 +376,83 @@ class Database():
         """
         raise NotImplementedError()
 
+    def close(self) -> None:
+        """Persist the DB before exiting so no committed data is lost."""
+        self.persist()
+
 
 class RedisDatabase(Database):
     """The database implementation using Redis database.
 
     Attributes:
         database: The Redis database.
+        server: The endpoint of the Redis server, either the socket or the port.
+        log_file_path: Path to the append-only commit log.
+        log_lock: The thread lock to keep the commit log consistent with the database.
     """
 
-    def __init__(self, name: str, db_file_path: Optional[str] = None, port: int = 6379):
+    # The number of logged commits that triggers a persist to compact the commit log
+    PERSIST_THRESHOLD = 1000
+
+    def __init__(self,
+                 name: str,
+                 db_file_path: Optional[str] = None,
+                 port: int = 6379,
+                 best_cache_size: Optional[int] = None,
+                 unix_socket_path: Optional[str] = None):
         """Constructor
 
         Args:
             name: The database name.
             db_file_path: Path to persist the database.
+            port: The port of the Redis server.
+            best_cache_size: The maximum number of best results to keep, or None for unlimited.
+            unix_socket_path: The UNIX domain socket of the Redis server. The TCP port is used
+                              if it is not given or does not exist.
         """
-        super(RedisDatabase, self).__init__(name, db_file_path)
+        super(RedisDatabase, self).__init__(name, db_file_path, best_cache_size)
+
+        # Indicate if the persisted data have been loaded. We must not persist before that,
+        # or the persisted file would be overwritten by an empty or partial database.
+        self._loaded = False
+
+        # Append-only log of the commits since the last persist. Each record is a pickled
+        # (key, pickled_result) pair prefixed by its length in 4-byte big-endian, so a commit
+        # only appends one record instead of dumping the whole database.
+        self.log_file_path = self.get_log_file_path(self.db_file_path)
+        self._log_fp: Optional[BinaryIO] = open(self.log_file_path, 'ab')
+        self._dirty_count = 0
+        self.log_lock = Lock()
+
+        # A mirror of the pickled data in Redis so persisting does not read them back
+        self._local_mirror: Dict[str, bytes] = {}
 
         import redis
 
         #TODO: scale-out
-        self.database = redis.StrictRedis(host='localhost', port=port)
+        # Prefer the UNIX domain socket since the server is local and it avoids the TCP
+        # loopback overhead on every Redis call
+        if unix_socket_path is not None and os.path.exists(unix_socket_path):
+            self.database = redis.StrictRedis(unix_socket_path=unix_socket_path,
+                                              health_check_interval=30)
+            self.server = 'socket {}'.format(unix_socket_path)
+        else:
+            if unix_socket_path is not None:
+                self.log.warning('Redis socket %s does not exist, connecting to port %d',
+                                 unix_socket_path, port)
+            self.database = redis.StrictRedis(host='localhost',
+                                              port=port,
+                                              socket_keepalive=True,
+                                              health_check_interval=30)
+            self.server = 'port {}'.format(port)
         self.database.flushdb()
 
         # Check the connection
         try:
             self.database.client_list()
         except redis.ConnectionError as err:
-            print('Error: Failed to connect to Redis database at port {}: {}'.format(port, str(err)))
+            print('Error: Failed to connect to Redis database at {}: {}'.format(
+                self.server, str(err)))
             sys.exit(1)
 
     def load(self) -> None:
@@ -264,27 +463,99 @@ class RedisDatabase(Database):
         if os.path.exists(self.db_file_path):
             with open(self.db_file_path, 'rb') as filep:
                 try:
-                    data = pickle.load(filep)
-                except ValueError as err:
+                    # Keys are bytes in the database dumped by HGETALL
+                    data: Dict[str, bytes] = {
+                        key.decode(encoding='UTF-8') if isinstance(key, bytes) else key: value
+                        for key, value in pickle.load(filep).items()
+                    }
+                except (ValueError, pickle.UnpicklingError, EOFError) as err:
+                    # Exit without touching the commit log since the database is not loaded
                     print('Failed to initialize the database: {}'.format(str(err)))
                     sys.exit(1)
+        else:
+            data = {}
+
+        # Replay the commits that have not been persisted yet
+        data.update(self.replay_log())
+
+        if data:
             self.log.info('Load %d data from an existing database', len(data))
-            self.database.hmset(self.db_id, data)
+            self.database.hset(self.db_id, mapping=data)
+            self._local_mirror.update(data)
+        self._loaded = True
+
+        self._init_caches()
+
+    @staticmethod
+    def get_log_file_path(db_file_path: str) -> str:
+        """Get the path of the commit log for the given database file.
+
+        Args:
+            db_file_path: Path to persist the database.
+
+        Returns:
+            Path to the commit log.
+        """
+        return '{0}.log'.format(db_file_path)
 
-        self.init_best_cache()
-        self.init_code_hash_map()
+    def replay_log(self) -> Dict[str, bytes]:
+        """Read the records in the commit log.
+
+        Returns:
+            A dictionary of keys and their pickled results in the commit order.
+        """
+
+        data: Dict[str, bytes] = {}
+        if not os.path.exists(self.log_file_path):
+            return data
+
+        with open(self.log_file_path, 'rb') as filep:
+            while True:
+                header = filep.read(4)
+                if len(header) < 4:
+                    break
+                size = struct.unpack('>I', header)[0]
+                frame = filep.read(size)
+                if len(frame) < size:
+                    # The last record was not completely written
+                    self.log.warning('Drop an incomplete record in %s', self.log_file_path)
+                    break
+                try:
+                    key, pickled_result = pickle.loads(frame)
+                except (ValueError, pickle.UnpicklingError) as err:
+                    self.log.error('Failed to replay the commit log: %s', str(err))
+                    break
+                data[key] = pickled_result
+        return data
+
+    def append_log(self, data: Dict[str, bytes]) -> None:
+        """Append the committed data to the commit log.
+
+        Args:
+            data: A dictionary of keys and their pickled results.
+        """
+
+        for key, pickled_result in data.items():
+            frame = pickle.dumps((key, pickled_result), pickle.HIGHEST_PROTOCOL)
+            self._log_fp.write(struct.pack('>I', len(frame)) + frame)
+        self._dirty_count += len(data)
+
+        # Flush to the OS but skip fsync; the log only has to survive a process crash
+        self._log_fp.flush()
 
     def __del__(self):
-        """Delete the data we generated in Redis database"""
+        """Persist the remaining commits and delete the data we generated in Redis database"""
+        # The database may be dropped without close() so we persist the commits that
+        # have not reached the persist threshold yet
+        if self._log_fp:
+            self.close()
         if self.database:
             self.database.delete(self.db_id)
 
     def query(self, key: str) -> Optional[Any]:
         #pylint:disable=missing-docstring
 
-        if not self.database.hexists(self.db_id, key):
-            return None
-
+        # HGET returns None for a missing key so we do not need an extra HEXISTS round-trip
         pickled_obj = self.database.hget(self.db_id, key)
         if pickled_obj:
             try:
@@ -319,34 +590,76 @@ class RedisDatabase(Database):
     def commit_impl(self, key: str, result: Any) -> bool:
         #pylint:disable=missing-docstring
 
-        pickled_result = pickle.dumps(result)
-        self.database.hset(self.db_id, key, pickled_result)
-        self.persist()
+        pickled_result = pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+        with self.log_lock:
+            if self._log_fp is None:
+                self.log.error('Failed to commit %s since the database has been closed', key)
+                return False
+            self.database.hset(self.db_id, key, pickled_result)
+            self._local_mirror[key] = pickled_result
+            self.append_log({key: pickled_result})
+        if self._dirty_count >= self.PERSIST_THRESHOLD:
+            self.persist()
         return True
 
     def batch_commit_impl(self, pairs: List[Tuple[str, Any]]) -> int:
         #pylint:disable=missing-docstring
 
-        data = {key: pickle.dumps(result) for key, result in pairs}
-        self.database.hmset(self.db_id, data)
-        self.persist()
+        data = dict(zip([key for key, _ in pairs], pickle_batch([result for _, result in pairs])))
+        with self.log_lock:
+            if self._log_fp is None:
+                self.log.error('Failed to commit %d results since the database has been closed',
+                               len(data))
+                return 0
+            self.database.hset(self.db_id, mapping=data)
+            self._local_mirror.update(data)
+            self.append_log(data)
+        if self._dirty_count >= self.PERSIST_THRESHOLD:
+            self.persist()
         return len(data)
 
     def count(self) -> int:
         #pylint:disable=missing-docstring
-        return len(self.database.hkeys(self.db_id))
+        # HLEN counts the fields on the server without transferring the keys
+        return self.database.hlen(self.db_id)
 
     def persist(self) -> bool:
         #pylint:disable=missing-docstring
-        dump_db = {
-            key: self.database.hget(self.db_id, key)
-            for key in self.database.hgetall(self.db_id)
-        }
-        with open(self.db_file_path, 'wb') as filep:
-            pickle.dump(dump_db, filep, pickle.HIGHEST_PROTOCOL)
-
+        if not self._loaded:
+            # The commits are still in the log and will be replayed by the next load
+            self.log.warning('Skip persisting the database that has not been loaded')
+            return False
+
+        with self.log_lock:
+            # The results in the mirror are already pickled so we dump them as they are.
+            # Dump to a temporary file and replace the database file at once, so a crash
+            # during the dump cannot leave a truncated database file.
+            tmp_file_path = '{0}.tmp'.format(self.db_file_path)
+            with open(tmp_file_path, 'wb') as filep:
+                pickle.dump(self._local_mirror, filep, pickle.HIGHEST_PROTOCOL)
+                filep.flush()
+                os.fsync(filep.fileno())
+            os.replace(tmp_file_path, self.db_file_path)
+
+            # All committed data are in the dumped file now so the log can be compacted
+            if self._log_fp is not None:
+                self._log_fp.seek(0)
+                self._log_fp.truncate()
+            self._dirty_count = 0
         return True
 
+    def close(self) -> None:
+        #pylint:disable=missing-docstring
+        if self._log_fp is None:
+            return
+        if self._loaded:
+            self.persist()
+
+        # Commits after this point are rejected
+        with self.log_lock:
+            self._log_fp.close()
+            self._log_fp = None
+
 
 class PickleDatabase(Database):
     """
@@ -361,8 +674,11 @@ class PickleDatabase(Database):
         database: The Pickle database.
     """
 
-    def __init__(self, name: str, db_file_path: Optional[str] = None):
-        super(PickleDatabase, self).__init__(name, db_file_path)
+    def __init__(self,
+                 name: str,
+                 db_file_path: Optional[str] = None,
+                 best_cache_size: Optional[int] = None):
+        super(PickleDatabase, self).__init__(name, db_file_path, best_cache_size)
 
         import pickledb
         self.lock = Lock()
@@ -377,28 +693,26 @@ class PickleDatabase(Database):
 
     def load(self) -> None:
         #pylint:disable=missing-docstring
-        import jsonpickle
 
         try:
-            # Decode objects
-            for key in self.database.getall():
-                obj = jsonpickle.decode(self.database.get(key))
-                self.database.set(key, obj)
+            # Decode objects in one pass over the underlying dict
+            self.database.db = {
+                key: decode_result(value)
+                for key, value in self.database.db.items()
+            }
             self.log.info('Load %d data from an existing database', self.count())
-        except ValueError as err:
+        except (ValueError, pickle.UnpicklingError) as err:
             print('Failed to load the data from the database: {}'.format(str(err)))
             sys.exit(1)
 
-        self.init_best_cache()
-        self.init_code_hash_map()
+        self._init_caches()
 
     def query(self, key: str) -> Optional[Any]:
         #pylint:disable=missing-docstring
 
-        self.lock.acquire()
-        value: Union[bool, Result] = self.database.get(key)
-        self.lock.release()
-        return None if isinstance(value, bool) else value
+        # Access the underlying dict directly to get None instead of False for missing keys
+        with self.lock:
+            return self.database.db.get(key)
 
     def batch_query(self, keys: List[str]) -> List[Optional[Any]]:
         #pylint:disable=missing=docstring
@@ -406,13 +720,9 @@ class PickleDatabase(Database):
         if not keys:
             return []
 
-        self.lock.acquire()
-        values: List[Optional[Any]] = []
-        for key in keys:
-            value = self.database.get(key)
-            values.append(None if isinstance(value, bool) else value)
-        self.lock.release()
-        return values
+        with self.lock:
+            db_dict: Dict[str, Any] = self.database.db
+            return [db_dict.get(key) for key in keys]
 
     def query_keys(self) -> List[str]:
         #pylint:disable=missing-docstring
@@ -421,18 +731,16 @@ class PickleDatabase(Database):
     def commit_impl(self, key: str, result: Result) -> bool:
         #pylint:disable=missing-docstring
 
-        self.lock.acquire()
-        self.database.set(key, result)
-        self.lock.release()
+        with self.lock:
+            self.database.set(key, result)
         return True
 
     def batch_commit_impl(self, pairs: List[Tuple[str, Any]]) -> int:
         #pylint:disable=missing-docstring
 
-        self.lock.acquire()
-        for key, result in pairs:
-            self.database.set(key, result)
-        self.lock.release()
+        with self.lock:
+            for key, result in pairs:
+                self.database.set(key, result)
         return len(pairs)
 
     def count(self) -> int:
@@ -442,10 +750,11 @@ class PickleDatabase(Database):
     def persist(self) -> bool:
         #pylint:disable=missing-docstring
 
-        import jsonpickle
-        # Pickle all results so that they are JSON seralizable
-        for key in self.database.getall():
-            pickled_obj = jsonpickle.encode(self.database.get(key))
-            self.database.set(key, pickled_obj)
+        # Pickle all results so that they are JSON seralizable. We encode them to a new dict
+        # and write it by ourselves so the database keeps the result objects.
+        with self.lock:
+            dump_db = {key: encode_result(value) for key, value in self.database.db.items()}
+        with open(self.db_file_path, 'w') as filep:
+            json.dump(dump_db, filep)
 
-        return self.database.dump()
+        return True
@@ -38,6 +38,11 @@ def arg_parser() -> argparse.Namespace:
                         action='store',
                         default='6379',
                         help='The port number for redis database')
+    parser.add_argument('--redis-socket',
+                        required=False,
+                        action='store',
+                        help='The UNIX domain socket for redis database (fall back to the port '
+                        'if unavailable)')
     parser.add_argument('--src-file',
                         required=False,
                         action='store',
@@ -180,12 +185,18 @@ class Main():
                 os.remove('eval.log')
 
         # Initialize database
-        self.log.info(f'Initializing the database at port {self.redis_port}')
+        self.log.info('Initializing the database')
         try:
-            self.db = RedisDatabase(self.config['project']['name'], self.db_path, self.redis_port)
+            # Only keep the best result
+            self.db = RedisDatabase(self.config['project']['name'],
+                                    self.db_path,
+                                    self.redis_port,
+                                    best_cache_size=1,
+                                    unix_socket_path=self.args.redis_socket)
         except RuntimeError:
             self.log.error('Failed to connect to the database')
             sys.exit(1)
+        self.log.info('Connected to the database at %s', self.db.server)
         self.db.load()
 
         # Initialize evaluator with FAST mode
@@ -218,6 +229,7 @@ class Main():
             self.log.info('Building the scope map')
             if not self.evaluator.build_scope_map(curr_point):
                 self.log.error('Failed to build the scope map. See eval.log for details')
+                self.db.close()
                 sys.exit(1)
 
             # Display important configs
@@ -236,13 +248,19 @@ class Main():
             if old_files:
                 bak_dir = tempfile.mkdtemp(prefix='bak_', dir=self.work_dir)
 
-                # Move all files except for config and database files to the backup directory
+                # Move all files except for config and database files to the backup directory.
+                # Note that the commit log has the results that are not persisted yet
+                # (e.g., the last run was killed) so we have to keep it as well.
+                keep_files = [
+                    self.cfg_path, self.db_path,
+                    RedisDatabase.get_log_file_path(self.db_path)
+                ]
                 for old_file in old_files:
                     # Skip the backup directory of previous runs
                     if old_file.startswith('bak_'):
                         continue
                     full_path = os.path.join(self.work_dir, old_file)
-                    if full_path not in [self.cfg_path, self.db_path]:
+                    if full_path not in keep_files:
                         shutil.move(full_path, bak_dir)
                     else:
                         shutil.copy(full_path, bak_dir)
@@ -389,9 +407,6 @@ class Main():
             timer: float = (time.time() - self.start_time) / 60.0  # in minutes
             while any([not exe.done() for exe in pool]):
                 time.sleep(1)
-                # Only keep the best result
-                while self.db.best_cache.qsize() > 1:
-                    self.db.best_cache.get()
 
                 # Print animation to let user know we are still working, or print dots every
                 # 5 mins if user disables the animation.
@@ -573,6 +588,20 @@ class Main():
 
     def main(self) -> None:
         """The main function of the DSE flow."""
+
+        if self.args.mode == 'fast-check':
+            # The database is not used in this mode
+            self.explore()
+            return
+
+        # Persist the database on every exit path, including the interrupt by users
+        try:
+            self.explore()
+        finally:
+            self.db.close()
+
+    def explore(self) -> None:
+        """Explore the design space and generate the outputs."""
         # Compile design space
         self.log.info('Compiling design space')
         ds = compile_design_space(
@@ -633,5 +662,9 @@ class Main():
             shutil.rmtree(self.log_dir)
         os.makedirs(self.log_dir)
 
+        db_log = RedisDatabase.get_log_file_path(self.db_path)
         for log in glob.glob('*.log'):
+            # The commit log of the database is not a log for users
+            if os.path.abspath(log) == db_log:
+                continue
             shutil.move(log, os.path.join(self.log_dir, log))
@@ -64,12 +64,11 @@ class Reporter():
     def log_best(self) -> None:
         """Log the new best result if available"""
 
-        try:
-            best_quality, _, best_result = max(self.db.best_cache.queue,
-                                               key=lambda r: r[0])  # type: ignore
-        except ValueError:
+        best = self.db.peek_best()
+        if best is None:
             # Best cache is still empty
             return
+        best_quality, _, best_key = best
 
         if self.is_first_best:
             self.log.info('Best result reporting...')
@@ -79,6 +78,10 @@ class Reporter():
             self.is_first_best = False
 
         if self.best_quality < best_quality:
+            # Only fetch the result when the best quality is improved
+            best_result = self.db.query(best_key)
+            if best_result is None:
+                return
             self.best_quality = best_quality
             self.log.info(
                 self.BestHistFormat.format(